@@ -1,4 +1,13 @@
-from aoc25.five.solution import DatabaseParser
+import io
+import random
+
+from aoc25.five.solution import (
+    DatabaseParser,
+    FreshRange,
+    FreshRangeSet,
+    IntervalSet,
+    Inventory,
+)
 
 
 def test_part_one_example():
@@ -52,3 +61,126 @@ def test_part_two_full_overlap():
     5-7"""
     inventory, ids = parser.parse(example)
     assert inventory.get_num_total_inventory() == 8
+
+
+def test_num_fresh_matches_bf():
+    rng = random.Random(18)
+    for _ in range(50):
+        fresh_ranges = []
+        for _ in range(rng.randint(0, 20)):
+            lower = rng.randint(0, 200)
+            fresh_ranges.append(FreshRange(lower, lower + rng.randint(-2, 30)))
+        inventory = Inventory(fresh_ranges)
+        query = [rng.randint(-5, 240) for _ in range(100)]
+        assert inventory.get_num_fresh(query) == inventory.get_num_fresh_bf(query)
+        assert inventory.get_num_total_inventory() == len(get_ids(fresh_ranges))
+
+
+def test_fresh_flags_match_is_fresh():
+    rng = random.Random(19)
+    for _ in range(50):
+        fresh_ranges = []
+        for _ in range(rng.randint(0, 20)):
+            lower = rng.randint(0, 200)
+            fresh_ranges.append(FreshRange(lower, lower + rng.randint(0, 30)))
+        inventory = Inventory(fresh_ranges)
+        query = [rng.randint(-5, 240) for _ in range(rng.randint(0, 100))]
+        for ordered in (query, sorted(query)):
+            expected = [inventory.is_fresh(query_id) for query_id in ordered]
+            for chunk_size in (1, 7, 1000):
+                flags = inventory.get_fresh_flags(iter(ordered), chunk_size)
+                assert flags == expected
+                total = inventory.get_num_fresh_batch(ordered, chunk_size)
+                assert total == sum(expected)
+
+
+def test_fresh_range_set_matches_inventory():
+    rng = random.Random(20)
+    fresh_ranges = []
+    fresh_set = FreshRangeSet()
+    for _ in range(200):
+        lower = rng.randint(0, 300)
+        fresh = FreshRange(lower, lower + rng.randint(-1, 20))
+        fresh_ranges.append(fresh)
+        fresh_set.add_range(fresh)
+        assert (
+            fresh_set.total_covered == Inventory(fresh_ranges).get_num_total_inventory()
+        )
+
+
+def test_fresh_range_set_remove_range():
+    rng = random.Random(21)
+    fresh_set = FreshRangeSet()
+    ids = set()
+    for _ in range(300):
+        lower = rng.randint(0, 300)
+        fresh = FreshRange(lower, lower + rng.randint(0, 20))
+        if rng.random() < 0.6:
+            fresh_set.add_range(fresh)
+            ids.update(range(fresh.lower, fresh.upper + 1))
+        else:
+            fresh_set.remove_range(fresh)
+            ids.difference_update(range(fresh.lower, fresh.upper + 1))
+
+        assert fresh_set.total_covered == len(ids)
+        assert all((i in fresh_set) == (i in ids) for i in range(-1, 330))
+
+
+def get_ids(fresh_ranges):
+    ids = set()
+    for fresh_range in fresh_ranges:
+        ids.update(range(fresh_range.lower, fresh_range.upper + 1))
+
+    return ids
+
+
+def test_interval_set_algebra():
+    rng = random.Random(22)
+    universe = FreshRange(-5, 250)
+
+    def random_ranges():
+        fresh_ranges = []
+        for _ in range(rng.randint(0, 10)):
+            lower = rng.randint(0, 200)
+            fresh_ranges.append(FreshRange(lower, lower + rng.randint(-1, 30)))
+        return fresh_ranges
+
+    for _ in range(100):
+        a_ranges = random_ranges()
+        b_ranges = random_ranges()
+        a = IntervalSet.from_ranges(a_ranges)
+        b = IntervalSet.from_ranges(b_ranges)
+        a_ids = get_ids(a_ranges)
+        b_ids = get_ids(b_ranges)
+        assert a.total_covered == len(a_ids)
+        assert get_ids(a.union(b)) == a_ids | b_ids
+        assert get_ids(a.intersection(b)) == a_ids & b_ids
+        assert get_ids(a.difference(b)) == a_ids - b_ids
+        assert get_ids(a.complement(universe)) == get_ids([universe]) - a_ids
+        assert a.union(b) == IntervalSet.from_ranges(a_ranges + b_ranges)
+        assert all((i in a) == (i in a_ids) for i in range(-5, 250))
+
+
+def test_parse_stream_example():
+    example = b"""3-5
+    10-14
+    16-20
+    12-18
+
+    1
+    5
+    8
+    11
+    17
+    32"""
+    fresh_set = FreshRangeSet()
+    results = list(DatabaseParser().parse_stream(io.BytesIO(example), fresh_set))
+    assert results == [
+        (1, False),
+        (5, True),
+        (8, False),
+        (11, True),
+        (17, True),
+        (32, False),
+    ]
+    assert fresh_set.total_covered == 14
@@ -1,7 +1,11 @@
 import dataclasses
 import enum
+import operator
 from collections import deque
-from typing import Self
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+from typing import Iterable, List, Optional, Self, Tuple
 
 
 class Tile(enum.Enum):
@@ -39,6 +43,124 @@ class DepartmentFloor:
         )
 
     def remove_all_rolls(self, max_adjacent: int) -> int:
+        # Same BFS as remove_all_rolls_bf, but over a copy of the floor with an empty border,
+        # so every neighbor is a fixed offset from the index and never out of bounds
+        rolls, adjacent = self.get_padded_floor()
+        stride = self.width + 2
+        neighbors = get_neighbor_offsets(stride)
+        queue = deque(
+            i for i in range(len(rolls)) if rolls[i] and adjacent[i] < max_adjacent
+        )
+        removed = []
+        while queue:
+            index = queue.popleft()
+            if rolls[index] and adjacent[index] < max_adjacent:
+                removed.append(index)
+                rolls[index] = 0
+                adjacent[index] = 0
+                for offset in neighbors:
+                    neighbor = index + offset
+                    if rolls[neighbor]:
+                        adjacent[neighbor] -= 1
+                        if adjacent[neighbor] < max_adjacent:
+                            queue.append(neighbor)
+
+        self.set_padded_floor(removed, adjacent)
+        return len(removed)
+
+    def remove_all_rolls_tiled(
+        self,
+        max_adjacent: int,
+        tile_size: int = 512,
+        max_workers: Optional[int] = None,
+    ) -> int:
+        """
+        Runs the cascade in worker processes, one square tile of the floor at a time
+        The padded floor lives in shared memory, and each round re-runs the tiles next to a tile
+        that removed something, until a round removes nothing
+        """
+        rolls, adjacent = self.get_padded_floor()
+        stride = self.width + 2
+        tiles = [
+            (x, y, min(x + tile_size, self.width), min(y + tile_size, self.height))
+            for y in range(0, self.height, tile_size)
+            for x in range(0, self.width, tile_size)
+        ]
+        shared = shared_memory.SharedMemory(create=True, size=len(rolls) * 2)
+        try:
+            shared.buf[: len(rolls)] = rolls
+            shared.buf[len(rolls) :] = adjacent
+            to_run = set(range(len(tiles)))
+            first_round = True
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                while to_run:
+                    batch = sorted(to_run)
+                    removed_counts = executor.map(
+                        remove_tile_rolls,
+                        repeat(shared.name),
+                        repeat(stride),
+                        [tiles[i] for i in batch],
+                        repeat(max_adjacent),
+                        repeat(first_round),
+                    )
+                    first_round = False
+                    changed = [
+                        tiles[i] for i, count in zip(batch, removed_counts) if count
+                    ]
+                    # A removal can only free up rolls in its own tile or a touching one
+                    to_run = {
+                        i
+                        for i, tile in enumerate(tiles)
+                        for other in changed
+                        if tile[0] <= other[2]
+                        and other[0] <= tile[2]
+                        and tile[1] <= other[3]
+                        and other[1] <= tile[3]
+                    }
+
+            final = bytes(shared.buf[: len(rolls)])
+        finally:
+            shared.close()
+            shared.unlink()
+
+        removed = [i for i in range(len(rolls)) if rolls[i] and not final[i]]
+        neighbors = get_neighbor_offsets(stride)
+        for index in removed:
+            adjacent[index] = 0
+            for offset in neighbors:
+                if final[index + offset]:
+                    adjacent[index + offset] -= 1
+
+        self.set_padded_floor(removed, adjacent)
+        return len(removed)
+
+    def get_padded_floor(self) -> Tuple[bytearray, bytearray]:
+        """Copies the rolls and adjacent counts into flat arrays with an empty border"""
+        stride = self.width + 2
+        rolls = bytearray(stride * (self.height + 2))
+        adjacent = bytearray(len(rolls))
+        is_roll = bytearray(map(operator.is_, self.floor_spaces, repeat(Tile.ROLL)))
+        for y in range(self.height):
+            row = slice(y * self.width, (y + 1) * self.width)
+            padded_row = slice((y + 1) * stride + 1, (y + 2) * stride - 1)
+            rolls[padded_row] = is_roll[row]
+            adjacent[padded_row] = bytes(self.num_adjacent[row])
+
+        return rolls, adjacent
+
+    def set_padded_floor(self, removed: List[int], adjacent: bytearray):
+        """Copies the results of a cascade over the padded floor back onto the floor"""
+        stride = self.width + 2
+        for index in removed:
+            y, x = divmod(index, stride)
+            self.floor_spaces[(y - 1) * self.width + x - 1] = Tile.REMOVED
+        for y in range(self.height):
+            padded_start = (y + 1) * stride + 1
+            self.num_adjacent[y * self.width : (y + 1) * self.width] = adjacent[
+                padded_start : padded_start + self.width
+            ]
+
+    def remove_all_rolls_bf(self, max_adjacent: int) -> int:
         # Do a BFS pass through the rolls, to remove all rolls until none can be removed
 
         neighbors = [
@@ -138,6 +260,239 @@ class DepartmentFloor:
         return Point(x, y)
 
 
+def get_neighbor_offsets(stride: int) -> List[int]:
+    return [-stride - 1, -stride, -stride + 1, -1, 1, stride - 1, stride, stride + 1]
+
+
+def remove_tile_rolls(
+    shared_name: str,
+    stride: int,
+    tile: Tuple[int, int, int, int],
+    max_adjacent: int,
+    first_round: bool,
+) -> int:
+    """
+    Runs the cascade inside one tile of a padded floor in shared memory
+    The shared memory holds the rolls, followed by the adjacent counts from before any removal
+    Rolls outside the tile are only read, so a neighboring tile removing them at the same time
+    can only make this tile keep a roll, which the next round checks again
+    """
+    shared = shared_memory.SharedMemory(name=shared_name)
+    try:
+        buffer = shared.buf
+        start_x, start_y, end_x, end_y = tile
+        floor_size = len(buffer) // 2
+        # Local arrays cover the tile's padded rows plus a halo row above and below
+        base = start_y * stride
+        local_size = (end_y - start_y + 2) * stride
+        inside = bytearray(local_size)
+        for y in range(1, end_y - start_y + 1):
+            inside[y * stride + start_x + 1 : y * stride + end_x + 1] = b"\x01" * (
+                end_x - start_x
+            )
+
+        neighbors = get_neighbor_offsets(stride)
+        rows = range(stride, (end_y - start_y + 1) * stride, stride)
+
+        def get_adjacent(local: int) -> int:
+            if adjacent[local] == 255:
+                index = base + local
+                adjacent[local] = sum(buffer[index + offset] for offset in neighbors)
+            return adjacent[local]
+
+        if first_round:
+            # Every count is still exact, so seed from the whole tile
+            adjacent = bytearray(
+                buffer[floor_size + base : floor_size + base + local_size]
+            )
+            queue = deque(
+                i
+                for row in rows
+                for i in range(row + start_x + 1, row + end_x + 1)
+                if buffer[base + i] and adjacent[i] < max_adjacent
+            )
+        else:
+            # The tile was left settled, so only its edges can see new removals next door
+            # Counts are worked out from the rolls when first needed, 255 means not yet
+            adjacent = bytearray(b"\xff") * local_size
+            first_row, last_row = rows[0], rows[-1]
+            edges = set(range(first_row + start_x + 1, first_row + end_x + 1))
+            edges.update(range(last_row + start_x + 1, last_row + end_x + 1))
+            edges.update(row + start_x + 1 for row in rows)
+            edges.update(row + end_x for row in rows)
+            queue = deque(
+                i
+                for i in sorted(edges)
+                if buffer[base + i] and get_adjacent(i) < max_adjacent
+            )
+
+        removed = 0
+        while queue:
+            local = queue.popleft()
+            if buffer[base + local] and adjacent[local] < max_adjacent:
+                removed += 1
+                buffer[base + local] = 0
+                for offset in neighbors:
+                    neighbor = local + offset
+                    if inside[neighbor] and buffer[base + neighbor]:
+                        if adjacent[neighbor] == 255:
+                            # Worked out after the removal above, so already counts it
+                            get_adjacent(neighbor)
+                        else:
+                            adjacent[neighbor] -= 1
+                        if adjacent[neighbor] < max_adjacent:
+                            queue.append(neighbor)
+
+        return removed
+    finally:
+        shared.close()
+
+
+# Enough bits to count all 8 neighbors
+NUM_COUNT_PLANES = 4
+# Turns a row of the layout into the binary digits of its rolls, anything but "." is a roll
+ROLL_BITS = bytes(ord("0") if byte == ord(".") else ord("1") for byte in range(256))
+
+
+def add_bit_plane(planes: List[int], bits: int):
+    """Adds one to the count of every set bit, where planes holds the count's binary digits"""
+    for i in range(len(planes)):
+        planes[i], bits = planes[i] ^ bits, planes[i] & bits
+
+
+def subtract_bit_plane(planes: List[int], bits: int):
+    """Subtracts one from the count of every set bit, the reverse of add_bit_plane"""
+    for i in range(len(planes)):
+        planes[i], bits = planes[i] ^ bits, ~planes[i] & bits
+
+
+def count_less_than(planes: List[int], value: int, mask: int) -> int:
+    """Returns the bits in mask whose count is less than value"""
+    if value >= 1 << len(planes):
+        return mask
+
+    # Compare from the highest binary digit down, tracking which counts still equal value
+    less = 0
+    equal = mask
+    for i in reversed(range(len(planes))):
+        if value >> i & 1:
+            less |= equal & ~planes[i]
+            equal &= planes[i]
+        else:
+            equal &= ~planes[i]
+
+    return less
+
+
+class PackedFloor:
+    """
+    Stores the whole floor as one int, one bit per space, so each neighbor check is a shift
+    Rows have an extra empty column, so shifting a row's ends sideways never reaches another row
+    """
+
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.rolls = 0
+        self.spaces = 0
+
+    @property
+    def stride(self) -> int:
+        return self.width + 1
+
+    @property
+    def neighbor_offsets(self) -> List[int]:
+        return get_neighbor_offsets(self.stride)
+
+    def populate_floor(self, layout: str):
+        rows = [line.strip() for line in layout.splitlines() if line.strip()]
+        if not rows:
+            return
+
+        self.width = len(rows[0])
+        self.height = len(rows)
+        # Bit x + y * stride is the space at (x, y), so reverse the text to put (0, 0) lowest
+        # Replacing non ascii characters keeps one byte per space, and they are rolls anyway
+        bits = b"".join(
+            row.encode("ascii", "replace").translate(ROLL_BITS) + b"0" for row in rows
+        )
+        self.rolls = int(bits[::-1], 2)
+        self.spaces = int((("1" * self.width + "0") * self.height)[::-1], 2)
+
+    def shift(self, bits: int, offset: int) -> int:
+        """Moves each bit's neighbor at the offset onto the bit"""
+        shifted = bits >> offset if offset > 0 else bits << -offset
+        return shifted & self.spaces
+
+    def count_neighbors(self, bits: int) -> List[int]:
+        planes = [0] * NUM_COUNT_PLANES
+        for offset in self.neighbor_offsets:
+            add_bit_plane(planes, self.shift(bits, offset))
+
+        return planes
+
+    def get_removable_mask(self, max_adjacent: int) -> int:
+        planes = self.count_neighbors(self.rolls)
+        return count_less_than(planes, max_adjacent, self.rolls)
+
+    def get_removable_rolls(self, max_adjacent: int) -> int:
+        return self.get_removable_mask(max_adjacent).bit_count()
+
+    def remove_rolls_in_waves(self, max_adjacent: int) -> List[int]:
+        """Removes every removable roll at once until none are left, returning each wave's size"""
+        planes = self.count_neighbors(self.rolls)
+        waves = []
+        while removable := count_less_than(planes, max_adjacent, self.rolls):
+            waves.append(removable.bit_count())
+            self.rolls &= ~removable
+            # Only the neighbors of removed rolls change, so take the removed rolls off their counts
+            for offset in self.neighbor_offsets:
+                subtract_bit_plane(planes, self.shift(removable, offset))
+
+        return waves
+
+    def remove_all_rolls(self, max_adjacent: int) -> int:
+        return sum(self.remove_rolls_in_waves(max_adjacent))
+
+
+def count_removable_rolls_streaming(rows: Iterable[bytes], max_adjacent: int) -> int:
+    """
+    Counts the removable rolls one row at a time, holding only the rows above and below
+    Each row is an int with bit x set for a roll at x, so memory does not grow with the height
+    """
+    total = 0
+    width_mask = 0
+    above = row = 0
+    row_seen = False
+    for line in rows:
+        line = line.strip()
+        if not line:
+            continue
+
+        below = int(line.translate(ROLL_BITS)[::-1], 2)
+        width_mask = (1 << len(line)) - 1
+        if row_seen:
+            total += count_removable_in_row(above, row, below, width_mask, max_adjacent)
+        above, row, row_seen = row, below, True
+
+    if row_seen:
+        total += count_removable_in_row(above, row, 0, width_mask, max_adjacent)
+
+    return total
+
+
+def count_removable_in_row(
+    above: int, row: int, below: int, width_mask: int, max_adjacent: int
+) -> int:
+    planes = [0] * NUM_COUNT_PLANES
+    for neighbors in (above, row, below):
+        add_bit_plane(planes, (neighbors << 1) & width_mask)
+        add_bit_plane(planes, neighbors >> 1)
+    add_bit_plane(planes, above)
+    add_bit_plane(planes, below)
+    return count_less_than(planes, max_adjacent, row).bit_count()
+
+
 def run() -> int:
     printing_department = DepartmentFloor()
     with open("input.txt", "r") as f:
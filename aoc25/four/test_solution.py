@@ -1,4 +1,29 @@
-from aoc25.four.solution import DepartmentFloor
+import random
+
+from aoc25.four.solution import (
+    DepartmentFloor,
+    PackedFloor,
+    count_removable_rolls_streaming,
+)
+
+EXAMPLE = """..@@.@@@@.
+@@@.@.@.@@
+@@@@@.@.@@
+@.@@@@..@.
+@@.@@@@.@@
+.@@@@@@@.@
+.@.@.@.@@@
+@.@@@.@@@@
+.@@@@@@@@.
+@.@.@@@.@."""
+
+
+def random_rows(rng, tiles=".@", max_size=20):
+    width = rng.randint(1, max_size)
+    return [
+        "".join(rng.choice(tiles) for _ in range(width))
+        for _ in range(rng.randint(1, max_size))
+    ]
 
 
 def test_part_one_example():
@@ -31,3 +56,122 @@ def test_part_two_example():
 @.@.@@@.@."""
     floor.populate_floor(example)
     assert floor.remove_all_rolls(4) == 43
+
+
+def test_packed_part_one_example():
+    floor = PackedFloor()
+    floor.populate_floor(EXAMPLE)
+    assert floor.get_removable_rolls(4) == 13
+
+
+def test_packed_matches_department_floor():
+    rng = random.Random(13)
+    for _ in range(50):
+        layout = "\n".join(random_rows(rng))
+        for max_adjacent in range(10):
+            floor = DepartmentFloor()
+            floor.populate_floor(layout)
+            packed = PackedFloor()
+            packed.populate_floor(layout)
+            assert packed.get_removable_rolls(
+                max_adjacent
+            ) == floor.get_removable_rolls(max_adjacent)
+
+
+def test_packed_treats_any_tile_as_roll():
+    rng = random.Random(23)
+    for _ in range(20):
+        layout = "\n".join(random_rows(rng, ".@x#é"))
+        floor = DepartmentFloor()
+        floor.populate_floor(layout)
+        packed = PackedFloor()
+        packed.populate_floor(layout)
+        assert packed.get_removable_rolls(4) == floor.get_removable_rolls(4)
+
+
+def test_remove_all_rolls_matches_bf():
+    rng = random.Random(14)
+    for _ in range(50):
+        layout = "\n".join(random_rows(rng, ".@@"))
+        floor = DepartmentFloor()
+        floor.populate_floor(layout)
+        bf_floor = DepartmentFloor()
+        bf_floor.populate_floor(layout)
+        assert floor.remove_all_rolls(4) == bf_floor.remove_all_rolls_bf(4)
+        assert floor.floor_spaces == bf_floor.floor_spaces
+        assert floor.num_adjacent == bf_floor.num_adjacent
+
+
+def test_packed_part_two_example():
+    floor = PackedFloor()
+    floor.populate_floor(EXAMPLE)
+    waves = floor.remove_rolls_in_waves(4)
+    assert waves[0] == 13
+    assert sum(waves) == 43
+
+
+def test_packed_waves_match_bfs():
+    rng = random.Random(15)
+    for _ in range(50):
+        layout = "\n".join(random_rows(rng, ".@@"))
+        for max_adjacent in range(1, 6):
+            floor = DepartmentFloor()
+            floor.populate_floor(layout)
+            packed = PackedFloor()
+            packed.populate_floor(layout)
+            assert packed.remove_all_rolls(max_adjacent) == floor.remove_all_rolls(
+                max_adjacent
+            )
+
+
+def test_count_removable_rolls_streaming(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text(EXAMPLE)
+    with open(path, "rb") as f:
+        assert count_removable_rolls_streaming(f, 4) == 13
+
+
+def test_count_removable_rolls_streaming_matches_packed():
+    rng = random.Random(16)
+    for _ in range(50):
+        rows = random_rows(rng)
+        packed = PackedFloor()
+        packed.populate_floor("\n".join(rows))
+        for max_adjacent in range(10):
+            assert count_removable_rolls_streaming(
+                [row.encode() for row in rows], max_adjacent
+            ) == packed.get_removable_rolls(max_adjacent)
+
+
+def test_count_removable_rolls_streaming_any_tile():
+    rng = random.Random(24)
+    for _ in range(20):
+        rows = random_rows(rng, ".@x#")
+        floor = DepartmentFloor()
+        floor.populate_floor("\n".join(rows))
+        assert count_removable_rolls_streaming(
+            [row.encode() for row in rows], 4
+        ) == floor.get_removable_rolls(4)
+
+
+def test_remove_all_rolls_tiled_matches_bfs():
+    rng = random.Random(17)
+    width = 37
+    layout = "\n".join(
+        "".join(rng.choice(".@@@") for _ in range(width)) for _ in range(41)
+    )
+    floor = DepartmentFloor()
+    floor.populate_floor(layout)
+    tiled = DepartmentFloor()
+    tiled.populate_floor(layout)
+    assert tiled.remove_all_rolls_tiled(4, tile_size=8, max_workers=2) == (
+        floor.remove_all_rolls(4)
+    )
+    assert tiled.floor_spaces == floor.floor_spaces
+    assert tiled.num_adjacent == floor.num_adjacent
+
+
+def test_remove_all_rolls_tiled_example():
+    floor = DepartmentFloor()
+    floor.populate_floor(EXAMPLE)
+    assert floor.remove_all_rolls_tiled(4, tile_size=3, max_workers=2) == 43
@@ -1,6 +1,11 @@
 import dataclasses
 import enum
-from typing import Self
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import accumulate, pairwise
+from typing import BinaryIO, Generator, List, Optional, Self, Tuple
 
 
 class Direction(enum.Enum):
@@ -34,6 +39,11 @@ class Dial:
         return passes
 
     def calculate_zero_passes(self, rotation: Rotation) -> int:
+        # The first pass happens after distance_to_zero steps, then one more every full revolution
+        distance_to_zero = self.distance_to_zero(rotation.direction)
+        return (rotation.steps + self.size - distance_to_zero) // self.size
+
+    def calculate_zero_passes_bf(self, rotation: Rotation) -> int:
         start = self.loc
         steps = rotation.steps
 
@@ -51,6 +61,13 @@ class Dial:
 
         return passes
 
+    def distance_to_zero(self, direction: Direction) -> int:
+        # Landing on zero counts, so starting at zero takes a full revolution to get back
+        if direction == Direction.LEFT:
+            return self.loc or self.size
+
+        return self.size - self.loc
+
     def rotate(self, rotation: Rotation):
         steps = rotation.steps
         if rotation.direction == Direction.LEFT:
@@ -61,17 +78,150 @@ class Dial:
         return self.loc == 0
 
 
-def run() -> int:
+@dataclasses.dataclass(frozen=True)
+class RotationLog:
+    # Signed step counts, with left rotations negative
+    steps: array
+
+    @classmethod
+    def parse_log(cls, log: bytes) -> Self:
+        # Turn "L68" into "-68" and "R48" into "48", so the whole log parses as plain ints
+        signed = log.replace(b"L", b"-").replace(b"R", b"")
+        return cls(array("q", map(int, signed.split())))
+
+    def rotate_tracking_passes(self, dial: Dial) -> int:
+        # Track the unwrapped position, so every multiple of size crossed is a pass over zero
+        # Moving right from a to b passes the multiples in (a, b], moving left the ones in [b, a)
+        size = dial.size
+        passes = 0
+        end = dial.loc
+        for start, end in pairwise(accumulate(self.steps, initial=dial.loc)):
+            if end >= start:
+                passes += end // size - start // size
+            else:
+                passes += (start - 1) // size - (end - 1) // size
+
+        dial.loc = end % size
+        return passes
+
+
+def stream_passwords(
+    log: BinaryIO, dial: Dial, chunk_size: int = 1 << 16
+) -> Generator[int, None, None]:
+    # Read fixed size chunks, holding back any partial record until the next chunk arrives
+    # Yields the running password after each chunk, so memory stays bounded by chunk_size
     password = 0
-    dial = Dial(50, 100)
-    with open("input.txt") as f:
-        for line in f.readlines():
-            if not line.strip():
+    remainder = b""
+    while chunk := log.read(chunk_size):
+        chunk = remainder + chunk
+        end = chunk.rfind(b"\n") + 1
+        remainder = chunk[end:]
+        password += RotationLog.parse_log(chunk[:end]).rotate_tracking_passes(dial)
+        yield password
+
+    if remainder.strip():
+        password += RotationLog.parse_log(remainder).rotate_tracking_passes(dial)
+        yield password
+
+
+@dataclasses.dataclass(frozen=True)
+class DialSegment:
+    # Summary of a run of rotations that does not depend on where the dial starts
+    # passes[s] is the number of zero passes when the run starts with the dial at s
+    size: int
+    displacement: int
+    passes: Tuple[int, ...]
+
+    @classmethod
+    def identity(cls, size: int) -> Self:
+        return cls(size, 0, (0,) * size)
+
+    @classmethod
+    def from_log(cls, log: RotationLog, size: int) -> Self:
+        # Starting at s shifts every unwrapped position by s, so a move passes zero once for each
+        # position t it covers with t == -s (mod size). Full revolutions count for every start,
+        # and the leftover positions mark a (wrapping) run of starts in a difference array
+        full_revolutions = 0
+        diff = [0] * (size + 1)
+        end = 0
+        for start, end in pairwise(accumulate(log.steps, initial=0)):
+            # positions covered are (start, end] moving right, [end, start) moving left
+            last = end if end >= start else start - 1
+            revolutions, remaining = divmod(abs(end - start), size)
+            full_revolutions += revolutions
+            if not remaining:
                 continue
-            rotation = Rotation.parse_rotation(line.strip())
-            password += dial.rotate_tracking_passes(rotation)
 
-    return password
+            first_start = -last % size
+            if first_start + remaining <= size:
+                diff[first_start] += 1
+                diff[first_start + remaining] -= 1
+            else:
+                diff[first_start] += 1
+                diff[size] -= 1
+                diff[0] += 1
+                diff[first_start + remaining - size] -= 1
+
+        passes = tuple(full_revolutions + p for p in accumulate(diff[:size]))
+        return cls(size, end, passes)
+
+    def combine(self, other: "DialSegment") -> "DialSegment":
+        # Run self, then other from wherever self left the dial
+        passes = tuple(
+            self.passes[s] + other.passes[(s + self.displacement) % self.size]
+            for s in range(self.size)
+        )
+        return DialSegment(self.size, self.displacement + other.displacement, passes)
+
+    def rotate_tracking_passes(self, dial: Dial) -> int:
+        passes = self.passes[dial.loc]
+        dial.loc = (dial.loc + self.displacement) % dial.size
+        return passes
+
+
+def split_log(path: str, chunk_size: int) -> List[Tuple[int, int]]:
+    # Split the file into byte ranges of roughly chunk_size, moved forward to the next line break
+    file_size = os.path.getsize(path)
+    offsets = [0]
+    with open(path, "rb") as f:
+        while offsets[-1] + chunk_size < file_size:
+            f.seek(offsets[-1] + chunk_size)
+            f.readline()
+            offsets.append(f.tell())
+
+    offsets.append(file_size)
+    return [(start, end) for start, end in pairwise(offsets) if start < end]
+
+
+def summarize_log_chunk(path: str, start: int, end: int, size: int) -> DialSegment:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return DialSegment.from_log(RotationLog.parse_log(f.read(end - start)), size)
+
+
+def summarize_log_parallel(
+    path: str,
+    size: int,
+    chunk_size: int = 1 << 24,
+    max_workers: Optional[int] = None,
+) -> DialSegment:
+    chunks = split_log(path, chunk_size)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        segments = executor.map(
+            summarize_log_chunk,
+            [path] * len(chunks),
+            [start for start, _ in chunks],
+            [end for _, end in chunks],
+            [size] * len(chunks),
+        )
+        # map yields in submission order, so the fold keeps the rotations in file order
+        return reduce(DialSegment.combine, segments, DialSegment.identity(size))
+
+
+def run() -> int:
+    dial = Dial(50, 100)
+    with open("input.txt", "rb") as f:
+        return RotationLog.parse_log(f.read()).rotate_tracking_passes(dial)
 
 
 if __name__ == "__main__":
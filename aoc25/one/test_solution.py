@@ -0,0 +1,111 @@
+import io
+import random
+from array import array
+
+from aoc25.one.solution import (
+    Dial,
+    DialSegment,
+    Direction,
+    Rotation,
+    RotationLog,
+    stream_passwords,
+    summarize_log_parallel,
+)
+
+
+def test_example():
+    dial = Dial(50, 100)
+    lines = ["L68", "L30", "R48", "L5", "R60", "L55", "L1", "L99", "R14", "L82"]
+    password = sum(
+        dial.rotate_tracking_passes(Rotation.parse_rotation(line)) for line in lines
+    )
+    assert password == 6
+
+
+def test_zero_passes_many_revolutions():
+    dial = Dial(50, 100)
+    assert dial.calculate_zero_passes(Rotation(1000, Direction.RIGHT)) == 10
+    assert dial.calculate_zero_passes(Rotation(1000, Direction.LEFT)) == 10
+
+
+def test_zero_passes_from_zero():
+    dial = Dial(0, 100)
+    assert dial.calculate_zero_passes(Rotation(99, Direction.LEFT)) == 0
+    assert dial.calculate_zero_passes(Rotation(100, Direction.LEFT)) == 1
+    assert dial.calculate_zero_passes(Rotation(100, Direction.RIGHT)) == 1
+
+
+def test_zero_passes_matches_bf():
+    rng = random.Random(2025)
+    for _ in range(2000):
+        size = rng.randint(1, 200)
+        dial = Dial(rng.randrange(size), size)
+        rotation = Rotation(
+            rng.randint(0, 5 * size), rng.choice([Direction.LEFT, Direction.RIGHT])
+        )
+        assert dial.calculate_zero_passes(rotation) == dial.calculate_zero_passes_bf(
+            rotation
+        )
+
+
+def test_rotation_log_example():
+    dial = Dial(50, 100)
+    log = RotationLog.parse_log(b"L68\nL30\nR48\nL5\nR60\nL55\nL1\nL99\nR14\nL82\n")
+    assert log.rotate_tracking_passes(dial) == 6
+    assert dial.loc == 32
+
+
+def test_rotation_log_matches_dial():
+    rng = random.Random(25)
+    lines = [f"{rng.choice('LR')}{rng.randint(0, 1000)}" for _ in range(5000)]
+    dial = Dial(50, 100)
+    expected = sum(
+        dial.rotate_tracking_passes(Rotation.parse_rotation(line)) for line in lines
+    )
+
+    batch_dial = Dial(50, 100)
+    log = RotationLog.parse_log("\n".join(lines).encode())
+    assert log.rotate_tracking_passes(batch_dial) == expected
+    assert batch_dial.loc == dial.loc
+
+
+def test_stream_passwords_small_chunks():
+    log = io.BytesIO(b"L68\nL30\nR48\nL5\nR60\nL55\nL1\nL99\nR14\nL82")
+    passwords = list(stream_passwords(log, Dial(50, 100), chunk_size=5))
+    assert passwords[-1] == 6
+    assert passwords == sorted(passwords)
+
+
+def test_dial_segment_matches_log():
+    rng = random.Random(4)
+    for _ in range(50):
+        size = rng.randint(1, 30)
+        steps = [rng.randint(-3 * size, 3 * size) for _ in range(rng.randint(0, 20))]
+        segment = DialSegment.from_log(RotationLog(array("q", steps)), size)
+        for start in range(size):
+            dial = Dial(start, size)
+            expected = RotationLog(array("q", steps)).rotate_tracking_passes(dial)
+            assert segment.passes[start] == expected
+            assert (start + segment.displacement) % size == dial.loc
+
+
+def test_dial_segment_combine():
+    rng = random.Random(5)
+    size = 100
+    steps = [rng.randint(-500, 500) for _ in range(300)]
+    segments = [
+        DialSegment.from_log(RotationLog(array("q", steps[i : i + 37])), size)
+        for i in range(0, len(steps), 37)
+    ]
+    combined = DialSegment.identity(size)
+    for segment in segments:
+        combined = combined.combine(segment)
+
+    assert combined == DialSegment.from_log(RotationLog(array("q", steps)), size)
+
+
+def test_summarize_log_parallel(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"L68\nL30\nR48\nL5\nR60\nL55\nL1\nL99\nR14\nL82\n")
+    segment = summarize_log_parallel(str(path), 100, chunk_size=8, max_workers=2)
+    assert segment.rotate_tracking_passes(Dial(50, 100)) == 6
@@ -1,8 +1,13 @@
 import dataclasses
 import enum
+import mmap
+import os
+import re
 from collections import deque
-from functools import reduce
-from typing import Generator, List, Optional
+from math import prod
+from typing import Generator, List, Self, Tuple
+
+NON_BLANK = re.compile(rb"\S")
 
 
 class Operator(enum.Enum):
@@ -16,11 +21,41 @@ class MathProblem:
     operator: Operator = Operator.ADD
 
     def solve(self) -> int:
-        return reduce(
-            lambda x, y: x * y if self.operator == Operator.MULTIPLY else x + y,
-            self.operands,
+        if self.operator == Operator.MULTIPLY:
+            return prod(self.operands)
+
+        return sum(self.operands)
+
+
+@dataclasses.dataclass
+class MathWorksheet:
+    """The part one worksheet as rows of operands, with one operator per column"""
+
+    rows: List[List[int]] = dataclasses.field(default_factory=list)
+    operators: List[Operator] = dataclasses.field(default_factory=list)
+
+    @classmethod
+    def parse_worksheet(cls, math_problems: str) -> Self:
+        lines = [line.split() for line in math_problems.splitlines() if line.strip()]
+        if not lines:
+            return cls()
+
+        *operand_rows, operator_row = lines
+        return cls(
+            [list(map(int, row)) for row in operand_rows],
+            [
+                Operator.MULTIPLY if value == "*" else Operator.ADD
+                for value in operator_row
+            ],
         )
 
+    def solve_all(self) -> List[int]:
+        # Transpose once, then each column is a single sum or prod call
+        return [
+            prod(column) if operator == Operator.MULTIPLY else sum(column)
+            for column, operator in zip(zip(*self.rows), self.operators)
+        ]
+
 
 class MathParser:
 
@@ -49,37 +84,110 @@ class MathParser:
         return problems
 
     def parse_part_two(self, math_problems: str) -> Generator[MathProblem, None, None]:
-        operands: List[Optional[int]] = []
-        operators = deque()
-        for line in math_problems.splitlines():
-            if not operands:
-                # Includes an extra None for the last group to be calculated
-                operands = [None] * (len(line) + 1)
-            for i, value in enumerate(line):
-                if not value.strip():
-                    continue
+        return self.parse_part_two_bytes(math_problems.encode())
 
-                if value.isdigit():
-                    # Update the corresponding spot with the new value
-                    if operands[i] is None:  # none check, in case 0
-                        operands[i] = int(value)
-                    else:
-                        operands[i] *= 10
-                        operands[i] += int(value)
-                else:
-                    operators.append(
-                        Operator.ADD if value == "+" else Operator.MULTIPLY
+    @staticmethod
+    def parse_part_two_bytes(
+        math_problems: bytes,
+    ) -> Generator[MathProblem, None, None]:
+        # Pad every line to the same width so the sheet is a grid, then read it by column
+        lines = [line for line in math_problems.splitlines() if line.strip()]
+        if not lines:
+            return
+
+        width = max(len(line) for line in lines)
+        *operand_rows, operator_row = [line.ljust(width) for line in lines]
+        operators = deque(
+            Operator.MULTIPLY if value == b"*" else Operator.ADD
+            for value in operator_row.split()
+        )
+
+        # Each column reads top to bottom as one number, and all blank columns split problems
+        operands = []
+        for column in zip(*operand_rows):
+            column = bytes(column)
+            if column.strip():
+                # Digits of a short number can sit on either side of a blank in its column
+                operands.append(int(column.translate(None, b" ")))
+            elif operands:
+                yield MathProblem(operands, operators.popleft())
+                operands = []
+
+        if operands:
+            yield MathProblem(operands, operators.popleft())
+
+    @staticmethod
+    def solve_stream(
+        path: str, part_two: bool = True, block_width: int = 1 << 12
+    ) -> Generator[int, None, None]:
+        """
+        Solves a worksheet file a block of columns at a time, yielding each problem's answer
+        Only the line offsets, one block of columns and the current problem are held in memory
+        """
+        if not os.path.getsize(path):
+            return
+
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as m:
+            lines = []
+            start = 0
+            while start < len(m):
+                end = m.find(b"\n", start)
+                if end == -1:
+                    end = len(m)
+                line_end = end - 1 if m[end - 1 : end] == b"\r" else end
+                # Search the mmap in place so a wide row is never copied out whole
+                if NON_BLANK.search(m, start, line_end):
+                    lines.append((start, line_end))
+                start = end + 1
+
+            if not lines:
+                return
+
+            width = max(end - start for start, end in lines)
+            *operand_lines, (operator_start, operator_end) = lines
+            operators = deque()
+            # The current problem's columns, which can carry over into the next block
+            columns = []
+            for block_start in range(0, width, block_width):
+                block_end = min(block_start + block_width, width)
+                row_start = operator_start + block_start
+                row_end = min(operator_start + block_end, operator_end)
+                operator_row = m[row_start:row_end]
+                operators.extend(
+                    Operator.MULTIPLY if value == b"*" else Operator.ADD
+                    for value in operator_row.split()
+                )
+                block = [
+                    m[start + block_start : min(start + block_end, end)].ljust(
+                        block_end - block_start
                     )
+                    for start, end in operand_lines
+                ]
+                for column in zip(*block):
+                    if bytes(column).strip():
+                        columns.append(column)
+                    elif columns:
+                        yield MathParser.solve_columns(
+                            columns, operators.popleft(), part_two
+                        )
+                        columns = []
+
+            if columns:
+                yield MathParser.solve_columns(columns, operators.popleft(), part_two)
 
-        # group all
-        current = []
-        for value in operands:
-            if value:
-                current.append(value)
-            elif current:
-                # yield the current math problem
-                yield MathProblem(current, operators.popleft())
-                current.clear()
+    @staticmethod
+    def solve_columns(
+        columns: List[Tuple[int, ...]], operator: Operator, part_two: bool
+    ) -> int:
+        # Part two reads each column as a number, part one reads each row across the columns
+        if part_two:
+            operands = [int(bytes(column).translate(None, b" ")) for column in columns]
+        else:
+            operands = [int(bytes(row)) for row in zip(*columns)]
+
+        return MathProblem(operands, operator).solve()
 
 
 def run() -> int:
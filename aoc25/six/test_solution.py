@@ -1,4 +1,4 @@
-from aoc25.six.solution import MathParser
+from aoc25.six.solution import MathParser, MathProblem, MathWorksheet, Operator
 
 
 def test_part_one_example():
@@ -19,3 +19,97 @@ def test_part_two_example():
 *   +   *   + """
     problems = parser.parse_part_two(example)
     assert sum(problem.solve() for problem in problems) == 3263827
+
+
+def test_worksheet_matches_parse():
+    example = """123 328  51 64
+ 45 64  387 23
+  6 98  215 314
+*   +   *   + """
+    worksheet = MathWorksheet.parse_worksheet(example)
+    assert worksheet.solve_all() == [
+        problem.solve() for problem in MathParser.parse(example)
+    ]
+    assert sum(worksheet.solve_all()) == 4277556
+
+
+def test_part_two_bytes_problems():
+    example = b"""123 328  51 64
+ 45 64  387 23
+  6 98  215 314
+*   +   *   +"""
+    problems = list(MathParser.parse_part_two_bytes(example))
+    assert problems == [
+        MathProblem([1, 24, 356], Operator.MULTIPLY),
+        MathProblem([369, 248, 8], Operator.ADD),
+        MathProblem([32, 581, 175], Operator.MULTIPLY),
+        MathProblem([623, 431, 4], Operator.ADD),
+    ]
+
+
+def test_part_two_bytes_interior_blanks():
+    # Left aligned numbers of different lengths leave blanks inside a column
+    example = b"314 35\n2   2 \n64  1 \n+   *  \n"
+    problems = list(MathParser.parse_part_two_bytes(example))
+    assert problems == [
+        MathProblem([326, 14, 4], Operator.ADD),
+        MathProblem([321, 5], Operator.MULTIPLY),
+    ]
+    example = b"84 220\n 2 2  \n97 54 \n+  +  \n"
+    problems = list(MathParser.parse_part_two_bytes(example))
+    assert problems == [
+        MathProblem([89, 427], Operator.ADD),
+        MathProblem([225, 24, 0], Operator.ADD),
+    ]
+
+
+def test_part_two_bytes_zero_column():
+    # A column of zeros is an operand, only a blank column splits problems
+    problems = list(MathParser.parse_part_two_bytes(b"10 5\n20 6\n+  *\n"))
+    assert problems == [
+        MathProblem([12, 0], Operator.ADD),
+        MathProblem([56], Operator.MULTIPLY),
+    ]
+
+
+def test_solve_stream(tmp_path):
+    example = """123 328  51 64
+ 45 64  387 23
+  6 98  215 314
+*   +   *   + """
+    path = tmp_path / "input.txt"
+    path.write_text(example)
+    for block_width in (1, 3, 5, 100):
+        assert (
+            list(
+                MathParser.solve_stream(
+                    str(path), part_two=False, block_width=block_width
+                )
+            )
+            == MathWorksheet.parse_worksheet(example).solve_all()
+        )
+        assert list(MathParser.solve_stream(str(path), block_width=block_width)) == [
+            problem.solve() for problem in MathParser().parse_part_two(example)
+        ]
+
+
+def test_solve_stream_blanks(tmp_path):
+    # Interior blanks in the columns, and a trailing line of spaces after the operators
+    example = "314 35\n2   2 \n64  1 \n+   *  \n   \n"
+    path = tmp_path / "input.txt"
+    path.write_text(example)
+    for block_width in (1, 3, 100):
+        assert list(MathParser.solve_stream(str(path), block_width=block_width)) == [
+            344,
+            1605,
+        ]
+        assert list(
+            MathParser.solve_stream(str(path), part_two=False, block_width=block_width)
+        ) == [380, 70]
+
+
+def test_solve_stream_only_blank_lines(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("  \n\n")
+    assert list(MathParser.solve_stream(str(path))) == []
+    assert list(MathParser.parse_part_two_bytes(b"  \n\n")) == []
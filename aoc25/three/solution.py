@@ -1,6 +1,12 @@
 import dataclasses
+import mmap
+import os
 from collections import deque
-from typing import Iterable, List, Optional, Self
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Generator, Iterable, List, Optional, Self, Sequence, Tuple
+
+# Maps ascii digits to their values, so a line of the input is already a list of cells
+ASCII_TO_DIGIT = bytes.maketrans(b"0123456789", bytes(range(10)))
 
 
 def list_to_int(digits: Iterable) -> int:
@@ -49,15 +55,72 @@ class BatteryBank:
         return cls([int(a) for a in value])
 
 
+class JoltageIndex:
+    # Sparse table over a bank, where table[j][i] is the leftmost max cell in cells[i:i + 2^j]
+    # Building it is O(n log n), then any range max is O(1), so every k is answered in O(k)
+
+    def __init__(self, cells: Sequence[int]):
+        self.cells = cells
+        self.table = [list(range(len(cells)))]
+        width = 1
+        while width * 2 <= len(cells):
+            previous = self.table[-1]
+            self.table.append(
+                [
+                    self.leftmost_max(previous[i], previous[i + width])
+                    for i in range(len(cells) - width * 2 + 1)
+                ]
+            )
+            width *= 2
+
+    def leftmost_max(self, left: int, right: int) -> int:
+        return left if self.cells[left] >= self.cells[right] else right
+
+    def argmax(self, lower: int, upper: int) -> int:
+        # Cover [lower, upper] with two overlapping power of two windows
+        level = (upper - lower + 1).bit_length() - 1
+        row = self.table[level]
+        return self.leftmost_max(row[lower], row[upper - (1 << level) + 1])
+
+    def find_max_joltage(self, num_to_activate: int) -> int:
+        # Same greedy as find_max_joltage_part_two_bf, with the inner scan replaced by argmax
+        num_to_activate = min(num_to_activate, len(self.cells))
+        front = 0
+        digits = []
+        for i in range(num_to_activate):
+            index = self.argmax(front, len(self.cells) - num_to_activate + i)
+            digits.append(self.cells[index])
+            front = index + 1
+
+        return list_to_int(digits)
+
+
 class JoltageCalculator:
     def __init__(self, num_active_cells: int):
         self.num_active_cells = num_active_cells
         self.total_joltage = 0
 
     def add_max_joltage(self, bank: BatteryBank):
-        self.total_joltage += self.find_max_joltage_part_two_linear(
-            bank, self.num_active_cells
-        )
+        self.add_max_joltage_cells(bank.cells)
+
+    def add_max_joltage_cells(self, cells: Sequence[int]):
+        self.total_joltage += self.find_max_joltage_stack(cells, self.num_active_cells)
+
+    def add_max_joltage_file(
+        self, path: str, chunk_size: int = 1 << 24, max_workers: Optional[int] = None
+    ):
+        # Banks are independent, so split the file by line and sum each chunk in its own process
+        chunks = split_banks(path, chunk_size)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            self.total_joltage += sum(
+                executor.map(
+                    sum_max_joltage_chunk,
+                    [path] * len(chunks),
+                    [start for start, _ in chunks],
+                    [end for _, end in chunks],
+                    [self.num_active_cells] * len(chunks),
+                )
+            )
 
     @staticmethod
     def find_max_joltage_part_one(bank: BatteryBank) -> int:
@@ -150,16 +213,87 @@ class JoltageCalculator:
 
         return list_to_int(head)
 
+    @staticmethod
+    def find_max_joltage_stack(cells: Sequence[int], num_to_activate: int) -> int:
+        # Same greedy as the linear version, but the kept digits live in a fixed size stack
+        # A digit pops every smaller digit before it while there are still drops left to spend
+        stack = bytearray(num_to_activate)
+        top = 0
+        drops = len(cells) - num_to_activate
+        for digit in cells:
+            while top and drops > 0 and stack[top - 1] < digit:
+                top -= 1
+                drops -= 1
+
+            if top < num_to_activate:
+                stack[top] = digit
+                top += 1
+            else:
+                drops -= 1
+
+        return list_to_int(stack[:top])
+
+    @staticmethod
+    def find_max_joltages(
+        cells: Sequence[int], activation_counts: Iterable[int]
+    ) -> Dict[int, int]:
+        index = JoltageIndex(cells)
+        return {k: index.find_max_joltage(k) for k in activation_counts}
+
+
+def read_banks(
+    path: str, start: int = 0, end: Optional[int] = None
+) -> Generator[bytes, None, None]:
+    # Memory map the file and hand out each line's cells, skipping the per character parsing
+    # start and end select a byte range, which should begin and end on line boundaries
+    if not os.path.getsize(path):
+        return
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        end = len(m) if end is None else end
+        while start < end:
+            line_end = m.find(b"\n", start, end)
+            if line_end == -1:
+                line_end = end
+
+            line = m[start:line_end].strip()
+            if line:
+                yield line.translate(ASCII_TO_DIGIT)
+            start = line_end + 1
+
+
+def split_banks(path: str, chunk_size: int) -> List[Tuple[int, int]]:
+    # Workers reuse read_banks on their own byte range, so each range has to hold whole banks
+    # Look for the first line break at or after every chunk_size bytes in the mapped file
+    if not os.path.getsize(path):
+        return []
+
+    chunks = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        start = 0
+        while start < len(m):
+            line_break = m.find(b"\n", min(start + chunk_size, len(m)))
+            end = len(m) if line_break == -1 else line_break + 1
+            chunks.append((start, end))
+            start = end
+
+    return chunks
+
+
+def sum_max_joltage_chunk(
+    path: str, start: int, end: int, num_active_cells: int
+) -> int:
+    calc = JoltageCalculator(num_active_cells)
+    for cells in read_banks(path, start, end):
+        calc.add_max_joltage_cells(cells)
+
+    return calc.total_joltage
+
 
 def run() -> int:
     calc = JoltageCalculator(12)
-    with open("input.txt", "r") as f:
-        for line in f:
-            if not line.strip():
-                continue
-
-            bank = BatteryBank.parse_bank(line.strip())
-            calc.add_max_joltage(bank)
+    for cells in read_banks("input.txt"):
+        calc.add_max_joltage_cells(cells)
 
     return calc.total_joltage
 
@@ -1,4 +1,11 @@
-from aoc25.three.solution import BatteryBank, JoltageCalculator
+import random
+
+from aoc25.three.solution import (
+    BatteryBank,
+    JoltageCalculator,
+    read_banks,
+    split_banks,
+)
 
 
 def test_part_one_examples():
@@ -152,3 +159,83 @@ def test_part_two_multi_larger():
         )
         == 998765456789
     )
+
+
+def test_part_two_stack_matches_other_engines():
+    rng = random.Random(3)
+    for _ in range(500):
+        bank = BatteryBank([rng.randint(1, 9) for _ in range(rng.randint(12, 40))])
+        num_to_activate = rng.randint(1, 12)
+        stack = JoltageCalculator.find_max_joltage_stack(bank.cells, num_to_activate)
+        assert stack == JoltageCalculator.find_max_joltage_part_two_bf(
+            bank, num_to_activate
+        )
+        assert stack == JoltageCalculator.find_max_joltage_part_two_linear(
+            bank, num_to_activate
+        )
+
+
+def test_part_two_stack_examples():
+    assert (
+        JoltageCalculator.find_max_joltage_stack(
+            BatteryBank.parse_bank("818181911112111").cells, 12
+        )
+        == 888911112111
+    )
+    assert (
+        JoltageCalculator.find_max_joltage_stack(
+            BatteryBank.parse_bank("1123456789098765432123456789").cells, 12
+        )
+        == 998765456789
+    )
+
+
+def test_read_banks(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_bytes(
+        b"987654321111111\n811111111111119\r\n\n234234234234278\n818181911112111"
+    )
+    calc = JoltageCalculator(12)
+    for cells in read_banks(str(path)):
+        calc.add_max_joltage_cells(cells)
+
+    assert calc.total_joltage == 3121910778619
+
+
+def test_find_max_joltages_examples():
+    bank = BatteryBank.parse_bank("818181911112111")
+    assert JoltageCalculator.find_max_joltages(bank.cells, [2, 12]) == {
+        2: 92,
+        12: 888911112111,
+    }
+
+
+def test_find_max_joltages_matches_stack():
+    rng = random.Random(11)
+    for _ in range(200):
+        cells = bytes(rng.randint(0, 9) for _ in range(rng.randint(1, 60)))
+        maxima = JoltageCalculator.find_max_joltages(cells, range(1, len(cells) + 1))
+        for k, joltage in maxima.items():
+            assert joltage == JoltageCalculator.find_max_joltage_stack(cells, k)
+
+
+def test_add_max_joltage_file(tmp_path):
+    rng = random.Random(12)
+    lines = ["".join(rng.choice("123456789") for _ in range(50)) for _ in range(200)]
+    path = tmp_path / "input.txt"
+    path.write_text("\n".join(lines))
+
+    serial = JoltageCalculator(12)
+    for line in lines:
+        serial.add_max_joltage(BatteryBank.parse_bank(line))
+
+    parallel = JoltageCalculator(12)
+    parallel.add_max_joltage_file(str(path), chunk_size=1000, max_workers=2)
+    assert parallel.total_joltage == serial.total_joltage
+
+
+def test_split_banks(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"12345\n678\n9\n12")
+    assert split_banks(str(path), 4) == [(0, 6), (6, 12), (12, 14)]
+    assert split_banks(str(path), 100) == [(0, 14)]
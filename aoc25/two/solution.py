@@ -1,6 +1,12 @@
 import dataclasses
+from bisect import bisect_right
 from collections import deque
-from typing import List, Self
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Generator, List, Optional, Self, Tuple
+
+# POWERS_OF_TEN[n] is the smallest number with n + 1 digits
+POWERS_OF_TEN = [10**i for i in range(40)]
 
 
 @dataclasses.dataclass(frozen=True)
@@ -9,12 +15,117 @@ class ProductRange:
     end: int
 
     def find_invalid_ids(self) -> List[int]:
+        return list(self.generate_invalid_ids())
+
+    def find_invalid_ids_bf(self) -> List[int]:
+        # Scans with is_id_valid_fast, not the original is_id_valid_part_two, which
+        # misses some repeated ids such as 66466646
         return [
             i
             for i in range(self.start, self.end + 1)
-            if not ProductRange.is_id_valid_part_two(i)
+            if not ProductRange.is_id_valid_fast(i)
+        ]
+
+    def generate_invalid_ids(self, part_two: bool = True) -> Generator[int, None, None]:
+        # Build the repeated numbers directly, instead of testing every id in the range
+        # A number of n digits repeating a block of p digits is the block times 10^(n-p) + ... + 10^p + 1
+        if self.end < self.start:
+            return
+
+        for num_digits in range(len(str(max(self.start, 1))), len(str(self.end)) + 1):
+            invalid = set()
+            for period in ProductRange.get_periods(num_digits, part_two):
+                multiplier = (10**num_digits - 1) // (10**period - 1)
+                # Blocks can't start with 0, and must land the number inside the range
+                low = max(10 ** (period - 1), -(-self.start // multiplier))
+                high = min(10**period - 1, self.end // multiplier)
+                invalid.update(block * multiplier for block in range(low, high + 1))
+
+            # A number can repeat with several periods (222222), so dedupe within a length
+            yield from sorted(invalid)
+
+    def sum_invalid_ids(self, part_two: bool = True) -> int:
+        # Each period's invalid ids are an arithmetic series of blocks times the multiplier, so
+        # sum them without building any. Ids repeating with several periods are counted once
+        # by inclusion-exclusion over the period classes
+        if self.end < self.start:
+            return 0
+
+        total = 0
+        for num_digits in range(len(str(max(self.start, 1))), len(str(self.end)) + 1):
+            for period, weight in ProductRange.get_period_weights(num_digits, part_two):
+                multiplier = (10**num_digits - 1) // (10**period - 1)
+                low = max(10 ** (period - 1), -(-self.start // multiplier))
+                high = min(10**period - 1, self.end // multiplier)
+                if low <= high:
+                    total += weight * multiplier * (low + high) * (high - low + 1) // 2
+
+        return total
+
+    @staticmethod
+    def get_period_weights(
+        num_digits: int, part_two: bool = True
+    ) -> List[Tuple[int, int]]:
+        # Any repeating number repeats with some period num_digits / q for a prime q, and
+        # repeating with two periods means repeating with their gcd. So the union of the
+        # period classes is an alternating sum over products of distinct prime factors
+        if not part_two:
+            return [(num_digits // 2, 1)] if num_digits % 2 == 0 else []
+
+        primes = ProductRange.get_prime_factors(num_digits)
+        weights = []
+        for mask in range(1, 1 << len(primes)):
+            divisor = 1
+            for i, prime in enumerate(primes):
+                if mask & (1 << i):
+                    divisor *= prime
+            weights.append((num_digits // divisor, 1 if mask.bit_count() % 2 else -1))
+
+        return weights
+
+    @staticmethod
+    def get_prime_factors(num: int) -> List[int]:
+        return [
+            q
+            for q in range(2, num + 1)
+            if num % q == 0 and all(q % f for f in range(2, q))
         ]
 
+    @staticmethod
+    @lru_cache
+    def get_repunit_divisors(num_digits: int, part_two: bool = True) -> Tuple[int, ...]:
+        # A number repeats with period p exactly when it divides by 10^(n-p) + ... + 10^p + 1
+        # Every period divides some num_digits / q for a prime q, so only those need checking
+        if not part_two:
+            periods = [num_digits // 2] if num_digits and num_digits % 2 == 0 else []
+        else:
+            periods = [
+                num_digits // q for q in ProductRange.get_prime_factors(num_digits)
+            ]
+
+        return tuple((10**num_digits - 1) // (10**p - 1) for p in periods)
+
+    @staticmethod
+    def is_id_valid_fast(product_id: int, part_two: bool = True) -> bool:
+        # Integer only version of is_id_valid and is_id_valid_part_two, which also catches the
+        # repeats the two pointer check misses, like 66466646
+        num_digits = bisect_right(POWERS_OF_TEN, product_id)
+        if num_digits == len(POWERS_OF_TEN):
+            num_digits = len(str(product_id))
+
+        for divisor in ProductRange.get_repunit_divisors(num_digits, part_two):
+            if product_id % divisor == 0:
+                return False
+
+        return True
+
+    @staticmethod
+    def get_periods(num_digits: int, part_two: bool = True) -> List[int]:
+        if not part_two:
+            return [num_digits // 2] if num_digits % 2 == 0 else []
+
+        return [p for p in range(1, num_digits) if num_digits % p == 0]
+
     @staticmethod
     def is_id_valid(product_id: int) -> bool:
         # The test is if it repeats itself, not if it repeats any digit
@@ -61,6 +172,30 @@ class ProductRange:
         diff = current_pointer - repeat_pointer
         return repeat_pointer == 0 or repeat_pointer % diff != 0
 
+    def split_by_digits(self) -> List["ProductRange"]:
+        # Break the range at each power of ten, so every piece has a single digit length
+        pieces = []
+        start = self.start
+        while start <= self.end:
+            end = min(self.end, 10 ** len(str(start)) - 1)
+            pieces.append(ProductRange(start, end))
+            start = end + 1
+
+        return pieces
+
+    @staticmethod
+    def merge_ranges(ranges: List["ProductRange"]) -> List["ProductRange"]:
+        merged = []
+        for product_range in sorted(ranges, key=lambda r: r.start):
+            # Adjacent ranges merge too, since there are no ids between them
+            if merged and product_range.start <= merged[-1].end + 1:
+                end = max(merged[-1].end, product_range.end)
+                merged[-1] = ProductRange(merged[-1].start, end)
+            else:
+                merged.append(product_range)
+
+        return merged
+
     @classmethod
     def parse_range(cls, products: str) -> Self:
         parts = products.split("-")
@@ -70,14 +205,27 @@ class ProductRange:
         return cls(int(parts[0]), int(parts[1]))
 
 
+def sum_invalid_ids_parallel(
+    ranges: List[ProductRange],
+    unique: bool = True,
+    part_two: bool = True,
+    max_workers: Optional[int] = None,
+) -> int:
+    # unique counts an id once even if several ranges include it, otherwise each range counts it
+    if unique:
+        ranges = ProductRange.merge_ranges(ranges)
+
+    pieces = [piece for r in ranges for piece in r.split_by_digits()]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return sum(
+            executor.map(ProductRange.sum_invalid_ids, pieces, [part_two] * len(pieces))
+        )
+
+
 def run() -> int:
     with open("input.txt", "r") as f:
         return sum(
-            [
-                invalid
-                for p in f.read().split(",")
-                for invalid in ProductRange.parse_range(p).find_invalid_ids()
-            ]
+            ProductRange.parse_range(p).sum_invalid_ids() for p in f.read().split(",")
         )
 
 
@@ -1,4 +1,14 @@
-from aoc25.two.solution import ProductRange
+from aoc25.two.solution import ProductRange, sum_invalid_ids_parallel
+
+
+def is_repeated(product_id: int) -> bool:
+    # Oracle: the id is some block of its digits written out two or more times
+    pid = str(product_id)
+    return any(
+        pid == pid[:p] * (len(pid) // p)
+        for p in range(1, len(pid))
+        if len(pid) % p == 0
+    )
 
 
 def test_find_valid_number_part_two():
@@ -50,3 +60,109 @@ def test_examples():
     assert not ProductRange.is_id_valid_part_two(565656)
     assert not ProductRange.is_id_valid_part_two(824824824)
     assert not ProductRange.is_id_valid_part_two(2121212121)
+
+
+def test_generate_invalid_ids_example():
+    assert ProductRange(11, 22).find_invalid_ids() == [11, 22]
+    assert ProductRange(95, 115).find_invalid_ids() == [99, 111]
+    assert ProductRange(998, 1012).find_invalid_ids() == [999, 1010]
+    assert list(ProductRange(95, 115).generate_invalid_ids(part_two=False)) == [99]
+
+
+def test_generate_invalid_ids_matches_bf():
+    for start, end in [(1, 5000), (222200, 222300), (1188511880, 1188511890)]:
+        product_range = ProductRange(start, end)
+        assert product_range.find_invalid_ids() == product_range.find_invalid_ids_bf()
+        assert list(product_range.generate_invalid_ids(part_two=False)) == [
+            i for i in range(start, end + 1) if not ProductRange.is_id_valid(i)
+        ]
+
+
+def test_generate_invalid_ids_fixes_two_pointer():
+    # The two pointer check misses 66466646 (6646 twice), so scanning with it found nothing here
+    product_range = ProductRange(66466600, 66466700)
+    assert product_range.find_invalid_ids() == [66466646]
+    assert product_range.sum_invalid_ids() == 66466646
+    assert [
+        i for i in range(66466600, 66466701) if not ProductRange.is_id_valid_part_two(i)
+    ] == []
+    assert [i for i in range(66466600, 66466701) if is_repeated(i)] == [66466646]
+
+
+def test_sum_invalid_ids_matches_generated():
+    for start, end in [(1, 5000), (11, 22), (95, 115), (100000, 999999)]:
+        product_range = ProductRange(start, end)
+        assert product_range.sum_invalid_ids() == sum(
+            product_range.generate_invalid_ids()
+        )
+        assert product_range.sum_invalid_ids(part_two=False) == sum(
+            product_range.generate_invalid_ids(part_two=False)
+        )
+
+
+def test_sum_invalid_ids_wide_range():
+    # Every 24 digit number made of two equal 12 digit halves
+    block_sum = (10**11 + 10**12 - 1) * (10**12 - 10**11) // 2
+    assert ProductRange(10**23, 10**24 - 1).sum_invalid_ids(part_two=False) == (
+        block_sum * (10**12 + 1)
+    )
+
+    narrow = ProductRange(10**23, 10**23 + 10**13)
+    assert narrow.sum_invalid_ids() == sum(narrow.generate_invalid_ids())
+
+
+def test_is_id_valid_fast_matches_two_pointer():
+    for i in list(range(0, 20000)) + list(range(1188511880, 1188511890)):
+        assert ProductRange.is_id_valid_fast(i) == ProductRange.is_id_valid_part_two(i)
+        assert ProductRange.is_id_valid_fast(i, part_two=False) == (
+            ProductRange.is_id_valid(i)
+        )
+
+
+def test_is_id_valid_fast_fixes_two_pointer():
+    # Each of these is a repeated block, which the two pointer check calls valid
+    for product_id in [66466646, 11711171, 88788878, 440444044404, 11069011106901]:
+        assert is_repeated(product_id)
+        assert not ProductRange.is_id_valid_fast(product_id)
+        assert ProductRange.is_id_valid_fast(product_id, part_two=False) == (
+            ProductRange.is_id_valid(product_id)
+        )
+        assert ProductRange.is_id_valid_part_two(product_id)
+
+
+def test_is_id_valid_fast_examples():
+    assert not ProductRange.is_id_valid_fast(10121012101210121012)
+    assert ProductRange.is_id_valid_fast(1111111111112)
+    assert not ProductRange.is_id_valid_fast(int("12" * 26))
+    assert ProductRange.is_id_valid_fast(int("12" * 26 + "1"))
+
+
+def test_merge_ranges():
+    ranges = [ProductRange(20, 30), ProductRange(1, 10), ProductRange(11, 15)]
+    assert ProductRange.merge_ranges(ranges) == [
+        ProductRange(1, 15),
+        ProductRange(20, 30),
+    ]
+    assert ProductRange.merge_ranges([ProductRange(1, 50), ProductRange(5, 7)]) == [
+        ProductRange(1, 50)
+    ]
+
+
+def test_split_by_digits():
+    assert ProductRange(95, 1012).split_by_digits() == [
+        ProductRange(95, 99),
+        ProductRange(100, 999),
+        ProductRange(1000, 1012),
+    ]
+
+
+def test_sum_invalid_ids_parallel_overlapping():
+    ranges = [ProductRange(1, 1000), ProductRange(500, 2000)]
+    unique = set(ProductRange(1, 2000).find_invalid_ids())
+    repeated = ProductRange(1, 1000).find_invalid_ids() + (
+        ProductRange(500, 2000).find_invalid_ids()
+    )
+    assert sum_invalid_ids_parallel(ranges, max_workers=2) == sum(unique)
+    assert sum_invalid_ids_parallel(ranges, unique=False, max_workers=2) == sum(
+        repeated
+    )